@@ -14,29 +14,127 @@ Run this file to see demos of all features including:
 
 import sys
 import os
+import io
+import re
+import contextlib
+import functools
+import warnings
+from collections import OrderedDict
+from decimal import Decimal
 
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.pcs.parser.tokenizer import Tokenizer
 from src.pcs.parser.parser import Parser
-from src.pcs.parser.evaluator import Evaluator
+from src.pcs.parser.evaluator import Evaluator, EvaluationResult
 from src.pcs.utils.unicode_formatter import UnicodeFormatter
 from src.pcs.utils.fraction_utils import frac, mixf, fraction_to_mixed
 from src.pcs.functions import load_custom_functions
 
+# The functions directory is scanned once per process, not once per instance;
+# app.py reaches it through PCS rather than keeping its own copy.
+_cached_load_custom_functions = functools.lru_cache(maxsize=1)(load_custom_functions)
+
+# Superscript/subscript forms of the digits 0-9, indexed by digit.
+SUPERSCRIPT_DIGITS = tuple(UnicodeFormatter.format_superscript(d) for d in "0123456789")
+SUBSCRIPT_DIGITS = tuple(UnicodeFormatter.format_subscript(d) for d in "0123456789")
+
+EVAL_CACHE_SIZE = 512
+AST_CACHE_SIZE = 512
+ARITH_COMPILE_CACHE_SIZE = 512
+
+
+# An expression containing none of these characters formats to itself;
+# '+' and '=' map to themselves in OPERATOR_MAP and are left out.
+_UNICODE_TRIGGER_CHARS = frozenset(
+    old[0] for old, new in UnicodeFormatter.OPERATOR_MAP.items() if old and old != new
+)
+
+
+def _format_expression(expression: str) -> str:
+    if _UNICODE_TRIGGER_CHARS.isdisjoint(expression):
+        return expression
+    return _format_expression_cached(expression)
+
+
+@functools.lru_cache(maxsize=2048)
+def _format_expression_cached(expression: str) -> str:
+    return UnicodeFormatter.format_expression(expression)
+
+
+@functools.lru_cache(maxsize=2048)
+def _format_value(value, value_type: type, display_type: str) -> str:
+    return UnicodeFormatter.format_result(value, display_type)
+
+
+def _format_result(result) -> str:
+    value = result.value
+    # Decimal('2.0') == Decimal('2') hashes equal but prints differently,
+    # and str() is all format_result does for it anyway.
+    if isinstance(value, Decimal):
+        return UnicodeFormatter.format_result(value, result.display_type)
+    try:
+        return _format_value(value, type(value), result.display_type)
+    except TypeError:
+        return UnicodeFormatter.format_result(value, result.display_type)
+
+
+# Literal-only arithmetic that CPython evaluates exactly like PCS does.
+# '**' and '//' are checked separately: PCS rejects them, Python does not.
+_SAFE_ARITH_RE = re.compile(r'[0-9\s+\-*/.()]+')
+
+
+@functools.lru_cache(maxsize=ARITH_COMPILE_CACHE_SIZE)
+def _compile_arith(expression: str):
+    with warnings.catch_warnings():
+        # e.g. "2 (3)" compiles with a "not callable" SyntaxWarning.
+        warnings.simplefilter('ignore')
+        return compile(expression, '<pcs>', 'eval')
+
+
+def _eval_arith(expression: str):
+    if ('**' in expression or '//' in expression
+            or not _SAFE_ARITH_RE.fullmatch(expression)):
+        return None
+    try:
+        value = eval(_compile_arith(expression), {'__builtins__': {}})
+    except Exception:
+        # Malformed input and division by zero go through the parser so
+        # the user sees PCS's own error message.
+        return None
+    if type(value) not in (int, float):
+        return None
+    return EvaluationResult(value)
+
+
+def _lru_store(cache: OrderedDict, key, value, maxsize: int):
+    """Insert into an OrderedDict used as an LRU, evicting the oldest entry."""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
 
 class PCS:
     """Main PCS interface for parsing and evaluating mathematical expressions."""
     
     def __init__(self):
         self.evaluator = Evaluator()
+        self._functions_version = 0
+        self._eval_cache = OrderedDict()
+        self._ast_cache = OrderedDict()
         self._load_functions()
     
     def _load_functions(self):
         """Load custom functions from the functions directory."""
-        custom_funcs = load_custom_functions()
-        for name, func in custom_funcs.items():
-            self.evaluator.register_function(name, func)
+        for name, func in _cached_load_custom_functions().items():
+            self.register_function(name, func)
+    
+    def register_function(self, name: str, func):
+        """Register a function and drop cached results that may depend on it."""
+        self.evaluator.register_function(name, func)
+        self._functions_version += 1
+        self._eval_cache.clear()
     
     def evaluate(self, expression: str) -> any:
         """
@@ -48,27 +146,154 @@ class PCS:
         Returns:
             The result of the evaluation
         """
+        cached = self._eval_cache.get(expression)
+        if cached is not None:
+            self._eval_cache.move_to_end(expression)
+            return cached
+        
+        result = _eval_arith(expression)
+        if result is None:
+            ast = self._parse(expression)
+            result = self.evaluator.evaluate(ast)
+        
+        _lru_store(self._eval_cache, expression, result, EVAL_CACHE_SIZE)
+        return result
+    
+    def _parse(self, expression: str):
+        """Tokenize and parse an expression into an AST.
+        
+        The AST is reused for any expression with an equal token stream.
+        """
         tokenizer = Tokenizer(expression)
         tokens = tokenizer.tokenize()
+        # The value's type is part of the key so that 2 and 2.0 stay distinct.
+        key = tuple((t.type, type(t.value), t.value) for t in tokens)
+        
+        ast = self._ast_cache.get(key)
+        if ast is not None:
+            self._ast_cache.move_to_end(key)
+            return ast
+        
         parser = Parser(tokens)
         ast = parser.parse()
-        result = self.evaluator.evaluate(ast)
-        return result
+        
+        _lru_store(self._ast_cache, key, ast, AST_CACHE_SIZE)
+        return ast
     
     def format_unicode(self, expression: str) -> str:
         """Convert expression to Unicode format with mathematical symbols."""
-        return UnicodeFormatter.format_expression(expression)
+        return _format_expression(expression)
     
     def format_result(self, result) -> str:
         """Format result for display."""
-        return UnicodeFormatter.format_result(result.value, result.display_type)
+        return _format_result(result)
+
+
+BASIC_ARITHMETIC_EXPRESSIONS = (
+    "2 + 3",
+    "10 - 4",
+    "6 * 7",
+    "20 / 4",
+    "2 + 3 * 4",
+    "(2 + 3) * 4",
+    "100 / 5 + 10",
+    "-5 + 10",
+    "3.14 * 2",
+    "10.5 / 2.5",
+)
+
+FRACTION_EXPRESSIONS = (
+    "frac(1, 2)",
+    "frac(3, 4)",
+    "frac(2, 3)",
+    "frac(5, 10)",
+    "frac(7, 3)",
+    "frac(1, 2) + frac(1, 4)",
+    "frac(3, 4) - frac(1, 2)",
+    "frac(2, 3) * frac(3, 4)",
+    "frac(1, 2) / frac(1, 4)",
+)
+
+MIXED_FRACTION_EXPRESSIONS = (
+    "mixf(1, 1, 2)",
+    "mixf(2, 3, 4)",
+    "mixf(3, 1, 3)",
+    "mixf(0, 5, 6)",
+    "mixf(1, 1, 2) + mixf(2, 1, 4)",
+    "mixf(3, 1, 2) - mixf(1, 3, 4)",
+    "mixf(2, 1, 2) * 2",
+)
+
+DECIMAL_EXPRESSIONS = (
+    "dec(3.14159, 2)",
+    "dec(2.71828, 3)",
+    "dec(1.0 / 3.0, 4)",
+    "dec(22 / 7, 6)",
+    "3.14159 + 2.71828",
+    "10.5 * 2.5",
+    "100.0 / 3.0",
+)
+
+CUSTOM_FUNCTION_EXPRESSIONS = (
+    "sqrt(16)",
+    "sqrt(2)",
+    "pow(2, 10)",
+    "pow(3, 4)",
+    "mod(17, 5)",
+    "floor(3.7)",
+    "ceil(3.2)",
+    "round(3.14159, 2)",
+    "gcd(48, 18)",
+    "lcm(4, 6)",
+    "abs(-5)",
+    "max(3, 7)",
+    "min(10, 5)",
+)
+
+COMPLEX_EXPRESSIONS = (
+    "frac(1, 2) + frac(1, 3) + frac(1, 6)",
+    "sqrt(pow(3, 2) + pow(4, 2))",
+    "mixf(2, 1, 2) * frac(2, 3)",
+    "(frac(1, 2) + frac(1, 4)) * 4",
+    "pow(2, 8) / pow(2, 4)",
+    "gcd(frac(12, 1), frac(18, 1))",
+)
+
+ALL_DEMO_EXPRESSIONS = (
+    BASIC_ARITHMETIC_EXPRESSIONS
+    + FRACTION_EXPRESSIONS
+    + MIXED_FRACTION_EXPRESSIONS
+    + DECIMAL_EXPRESSIONS
+    + CUSTOM_FUNCTION_EXPRESSIONS
+    + COMPLEX_EXPRESSIONS
+)
+
+_SHARED_PCS = None
+
+
+def _get_shared_pcs() -> PCS:
+    """Return the PCS instance shared by the demos and interactive mode."""
+    global _SHARED_PCS
+    if _SHARED_PCS is None:
+        _SHARED_PCS = PCS()
+    return _SHARED_PCS
+
+
+def _warmup():
+    """Seed the shared evaluation cache with every demo expression."""
+    pcs = _get_shared_pcs()
+    for expr in ALL_DEMO_EXPRESSIONS:
+        try:
+            pcs.evaluate(expr)
+        except Exception:
+            # Left uncached; print_test reports the error when the demo runs.
+            pass
 
 
 def print_header(title: str):
     """Print a formatted header."""
-    print("\n" + "=" * 60)
-    print(f" {title}")
-    print("=" * 60)
+    rule = "=" * 60
+    print(f"\n{rule}\n {title}\n{rule}")
 
 
 def print_test(expression: str, pcs: PCS, show_unicode: bool = True):
@@ -91,22 +316,9 @@ def print_test(expression: str, pcs: PCS, show_unicode: bool = True):
 def demo_basic_arithmetic():
     """Demo basic arithmetic operations."""
     print_header("1. Basic Arithmetic Operations (+, -, *, /)")
-    pcs = PCS()
-    
-    expressions = [
-        "2 + 3",
-        "10 - 4",
-        "6 * 7",
-        "20 / 4",
-        "2 + 3 * 4",
-        "(2 + 3) * 4",
-        "100 / 5 + 10",
-        "-5 + 10",
-        "3.14 * 2",
-        "10.5 / 2.5",
-    ]
+    pcs = _get_shared_pcs()
     
-    for expr in expressions:
+    for expr in BASIC_ARITHMETIC_EXPRESSIONS:
         print_test(expr, pcs, show_unicode=False)
 
 
@@ -124,7 +336,7 @@ def demo_unicode_conversion():
     formatter = UnicodeFormatter
     
     for expr, desc in examples:
-        unicode_expr = formatter.format_expression(expr)
+        unicode_expr = _format_expression(expr)
         alpha_expr = formatter.to_alphanumeric(unicode_expr)
         print(f"  {desc}:")
         print(f"    Original:    {expr}")
@@ -133,34 +345,20 @@ def demo_unicode_conversion():
         print()
     
     print("  Superscripts (powers):")
-    for i in range(0, 10):
-        sup = formatter.format_superscript(str(i))
+    for i, sup in enumerate(SUPERSCRIPT_DIGITS):
         print(f"    x^{i} = x{sup}")
     
     print("\n  Subscripts:")
-    for i in range(0, 10):
-        sub = formatter.format_subscript(str(i))
+    for i, sub in enumerate(SUBSCRIPT_DIGITS):
         print(f"    x_{i} = x{sub}")
 
 
 def demo_fractions():
     """Demo fraction operations."""
     print_header("3. Fraction Operations - frac(numerator, denominator)")
-    pcs = PCS()
-    
-    expressions = [
-        "frac(1, 2)",
-        "frac(3, 4)",
-        "frac(2, 3)",
-        "frac(5, 10)",
-        "frac(7, 3)",
-        "frac(1, 2) + frac(1, 4)",
-        "frac(3, 4) - frac(1, 2)",
-        "frac(2, 3) * frac(3, 4)",
-        "frac(1, 2) / frac(1, 4)",
-    ]
+    pcs = _get_shared_pcs()
     
-    for expr in expressions:
+    for expr in FRACTION_EXPRESSIONS:
         print_test(expr, pcs)
     
     print("\n  Unicode Fraction Characters:")
@@ -177,89 +375,44 @@ def demo_fractions():
 def demo_mixed_fractions():
     """Demo mixed fraction operations."""
     print_header("4. Mixed Fraction Operations - mixf(whole, num, den)")
-    pcs = PCS()
-    
-    expressions = [
-        "mixf(1, 1, 2)",
-        "mixf(2, 3, 4)",
-        "mixf(3, 1, 3)",
-        "mixf(0, 5, 6)",
-        "mixf(1, 1, 2) + mixf(2, 1, 4)",
-        "mixf(3, 1, 2) - mixf(1, 3, 4)",
-        "mixf(2, 1, 2) * 2",
-    ]
+    pcs = _get_shared_pcs()
     
     print("  mixf(whole, numerator, denominator) creates a mixed number")
     print("  Example: mixf(1, 1, 2) = 1 1/2 = 3/2")
     print()
     
-    for expr in expressions:
+    for expr in MIXED_FRACTION_EXPRESSIONS:
         print_test(expr, pcs)
 
 
 def demo_decimals():
     """Demo decimal operations."""
     print_header("5. Decimal Operations - dec(value, precision)")
-    pcs = PCS()
-    
-    expressions = [
-        "dec(3.14159, 2)",
-        "dec(2.71828, 3)",
-        "dec(1.0 / 3.0, 4)",
-        "dec(22 / 7, 6)",
-        "3.14159 + 2.71828",
-        "10.5 * 2.5",
-        "100.0 / 3.0",
-    ]
+    pcs = _get_shared_pcs()
     
-    for expr in expressions:
+    for expr in DECIMAL_EXPRESSIONS:
         print_test(expr, pcs)
 
 
 def demo_custom_functions():
     """Demo custom extensible functions."""
     print_header("6. Custom Functions (from functions/ directory)")
-    pcs = PCS()
-    
-    expressions = [
-        "sqrt(16)",
-        "sqrt(2)",
-        "pow(2, 10)",
-        "pow(3, 4)",
-        "mod(17, 5)",
-        "floor(3.7)",
-        "ceil(3.2)",
-        "round(3.14159, 2)",
-        "gcd(48, 18)",
-        "lcm(4, 6)",
-        "abs(-5)",
-        "max(3, 7)",
-        "min(10, 5)",
-    ]
+    pcs = _get_shared_pcs()
     
     print("  Available functions from math_basic.py:")
     print("  sqrt, pow, mod, floor, ceil, round, gcd, lcm, abs, max, min")
     print()
     
-    for expr in expressions:
+    for expr in CUSTOM_FUNCTION_EXPRESSIONS:
         print_test(expr, pcs)
 
 
 def demo_complex_expressions():
     """Demo complex expressions combining multiple features."""
     print_header("7. Complex Expressions")
-    pcs = PCS()
+    pcs = _get_shared_pcs()
     
-    expressions = [
-        "frac(1, 2) + frac(1, 3) + frac(1, 6)",
-        "sqrt(pow(3, 2) + pow(4, 2))",
-        "mixf(2, 1, 2) * frac(2, 3)",
-        "(frac(1, 2) + frac(1, 4)) * 4",
-        "pow(2, 8) / pow(2, 4)",
-        "gcd(frac(12, 1), frac(18, 1))",
-    ]
-    
-    for expr in expressions:
+    for expr in COMPLEX_EXPRESSIONS:
         print_test(expr, pcs)
 
 
@@ -293,7 +446,7 @@ def run_interactive():
     print("  Type 'quit' or 'exit' to exit.")
     print()
     
-    pcs = PCS()
+    pcs = _get_shared_pcs()
     
     while True:
         try:
@@ -322,27 +475,36 @@ def run_interactive():
 
 def main():
     """Main function to run all demos."""
-    print("\n" + "=" * 60)
-    print("   PCS - Parser Commander Science")
-    print("   Mathematical Parser System Demo")
-    print("=" * 60)
-    
-    demo_basic_arithmetic()
-    demo_unicode_conversion()
-    demo_fractions()
-    demo_mixed_fractions()
-    demo_decimals()
-    demo_custom_functions()
-    demo_complex_expressions()
-    demo_stacked_fractions()
-    
-    print("\n" + "=" * 60)
-    print("  All demos completed successfully!")
-    print("=" * 60)
+    # Collect the demo output and write it in one go instead of
+    # hitting stdout once per line.
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            print("\n" + "=" * 60)
+            print("   PCS - Parser Commander Science")
+            print("   Mathematical Parser System Demo")
+            print("=" * 60)
+            
+            demo_basic_arithmetic()
+            demo_unicode_conversion()
+            demo_fractions()
+            demo_mixed_fractions()
+            demo_decimals()
+            demo_custom_functions()
+            demo_complex_expressions()
+            demo_stacked_fractions()
+            
+            print("\n" + "=" * 60)
+            print("  All demos completed successfully!")
+            print("=" * 60)
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
     
     if len(sys.argv) > 1 and sys.argv[1] == '-i':
         run_interactive()
 
 
 if __name__ == "__main__":
+    _warmup()
     main()
@@ -13,20 +13,13 @@ import os
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.completion import WordCompleter, Completer, Completion
-from prompt_toolkit.lexers import PygmentsLexer
+from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.styles import Style
 from prompt_toolkit.formatted_text import HTML
-from pygments.lexers import PythonLexer
 
-from src.pcs.parser.tokenizer import Tokenizer
-from src.pcs.parser.parser import Parser
-from src.pcs.parser.evaluator import Evaluator
 from src.pcs.utils.unicode_formatter import UnicodeFormatter
-from src.pcs.functions import load_custom_functions
+
+from PSC import PCS, SUPERSCRIPT_DIGITS, SUBSCRIPT_DIGITS
 
 
 BUILTIN_FUNCTIONS = [
@@ -40,6 +33,8 @@ COMMANDS = [
     'history', 'functions', 'unicode', 'examples'
 ]
 
+EXIT_COMMANDS = frozenset({'exit', 'quit', 'q'})
+
 FUNCTION_DOCS = {
     'frac': 'frac(a, b) - Tao phan so a/b. Vi du: frac(1, 2) = 1/2',
     'mixf': 'mixf(w, a, b) - Tao hon so w a/b. Vi du: mixf(1, 1, 2) = 1 1/2',
@@ -57,62 +52,63 @@ FUNCTION_DOCS = {
     'abs': 'abs(x) - Gia tri tuyet doi. Vi du: abs(-5) = 5',
 }
 
+# Erase the display and move the cursor home.
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+
 
 class PCSCompleter(Completer):
+    _META_MAP = {
+        'frac': 'phan so',
+        'mixf': 'hon so',
+        'dec': 'thap phan',
+        'sqrt': 'can bac 2',
+        'pow': 'luy thua',
+        'mod': 'chia lay du',
+        'floor': 'lam tron xuong',
+        'ceil': 'lam tron len',
+        'round': 'lam tron',
+        'gcd': 'UCLN',
+        'lcm': 'BCNN',
+        'max': 'max',
+        'min': 'min',
+        'abs': 'tri tuyet doi',
+    }
+    
     def __init__(self):
         self.functions = BUILTIN_FUNCTIONS
         self.commands = COMMANDS
+        # (name, insert text, meta label) for every name, built once in the
+        # menu order: commands first, then functions as listed.
+        function_entries = [
+            (name, name + '(', self._get_meta(name)) for name in self.functions
+        ]
+        self._all_entries = [
+            (name, name, 'command') for name in self.commands
+        ] + function_entries
+        self._function_entries = function_entries
     
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor
         word = document.get_word_before_cursor()
         
         if not text.strip() or text.strip() == word:
-            all_items = self.commands + self.functions
-            for item in all_items:
-                if item.startswith(word.lower()):
-                    if item in self.functions:
-                        yield Completion(
-                            item + '(',
-                            start_position=-len(word),
-                            display=item,
-                            display_meta=self._get_meta(item)
-                        )
-                    else:
-                        yield Completion(
-                            item,
-                            start_position=-len(word),
-                            display=item,
-                            display_meta='command'
-                        )
+            entries = self._all_entries
         else:
-            for func in self.functions:
-                if func.startswith(word.lower()):
-                    yield Completion(
-                        func + '(',
-                        start_position=-len(word),
-                        display=func,
-                        display_meta=self._get_meta(func)
-                    )
+            entries = self._function_entries
+        
+        prefix = word.lower()
+        start_position = -len(word)
+        for name, insert_text, meta in entries:
+            if name.startswith(prefix):
+                yield Completion(
+                    insert_text,
+                    start_position=start_position,
+                    display=name,
+                    display_meta=meta
+                )
     
     def _get_meta(self, func):
-        meta_map = {
-            'frac': 'phan so',
-            'mixf': 'hon so',
-            'dec': 'thap phan',
-            'sqrt': 'can bac 2',
-            'pow': 'luy thua',
-            'mod': 'chia lay du',
-            'floor': 'lam tron xuong',
-            'ceil': 'lam tron len',
-            'round': 'lam tron',
-            'gcd': 'UCLN',
-            'lcm': 'BCNN',
-            'max': 'max',
-            'min': 'min',
-            'abs': 'tri tuyet doi',
-        }
-        return meta_map.get(func, 'function')
+        return self._META_MAP.get(func, 'function')
 
 
 STYLE = Style.from_dict({
@@ -123,45 +119,8 @@ STYLE = Style.from_dict({
 
 
 class PCSShell:
-    def __init__(self):
-        self.evaluator = Evaluator()
-        self._load_functions()
-        
-        history_file = os.path.expanduser('~/.pcs_history')
-        
-        self.session = PromptSession(
-            history=FileHistory(history_file),
-            auto_suggest=AutoSuggestFromHistory(),
-            completer=PCSCompleter(),
-            lexer=PygmentsLexer(PythonLexer),
-            style=STYLE,
-            complete_while_typing=True,
-        )
-    
-    def _load_functions(self):
-        custom_funcs = load_custom_functions()
-        for name, func in custom_funcs.items():
-            self.evaluator.register_function(name, func)
-    
-    def get_prompt(self):
-        return HTML('<prompt>PCS</prompt> <arrow>></arrow> ')
-    
-    def evaluate(self, expression: str):
-        tokenizer = Tokenizer(expression)
-        tokens = tokenizer.tokenize()
-        parser = Parser(tokens)
-        ast = parser.parse()
-        result = self.evaluator.evaluate(ast)
-        return result
-    
-    def format_result(self, result) -> str:
-        return UnicodeFormatter.format_result(result.value, result.display_type)
-    
-    def format_unicode(self, expression: str) -> str:
-        return UnicodeFormatter.format_expression(expression)
-    
-    def show_help(self):
-        print("""
+    # Static screens are rendered once here; the show_* methods just write them.
+    _HELP_TEXT = """
 \033[1;32m============================================================
    PCS - Parser Commander Science
    Mathematical Calculator with IntelliSense
@@ -186,17 +145,20 @@ class PCSShell:
   - Nhan Tab de xem goi y ham (IntelliSense)
   - Dung phim mui ten len/xuong de xem lich su lenh
   - Ket qua se tu dong chuyen sang Unicode dep
-""")
+
+"""
     
-    def show_functions(self):
-        print("\n\033[1;36mDANH SACH HAM:\033[0m")
-        print("-" * 60)
-        for func, doc in FUNCTION_DOCS.items():
-            print(f"  \033[1;33m{func:10}\033[0m - {doc.split(' - ')[1]}")
-        print()
+    _FUNCTIONS_TEXT = (
+        "\n\033[1;36mDANH SACH HAM:\033[0m\n"
+        + "-" * 60 + "\n"
+        + "".join(
+            f"  \033[1;33m{func:10}\033[0m - {doc.split(' - ')[1]}\n"
+            for func, doc in FUNCTION_DOCS.items()
+        )
+        + "\n"
+    )
     
-    def show_examples(self):
-        print("""
+    _EXAMPLES_TEXT = """
 \033[1;36mVI DU SU DUNG:\033[0m
 ---------------------------------------------------------
 \033[1;33mPhep tinh co ban:\033[0m
@@ -222,27 +184,89 @@ class PCSShell:
   pow(2, 10)                -> 1024
   gcd(48, 18)               -> 6
   sqrt(pow(3, 2) + pow(4, 2)) -> 5
-""")
+
+"""
+    
+    def __init__(self):
+        # Parsing, evaluation and their caches live in PCS; the shell only
+        # adds the interactive front-end.
+        self.pcs = PCS()
+        self.evaluator = self.pcs.evaluator
+        
+        if os.name == 'nt':
+            # Turns on VT escape handling in the Windows console.
+            os.system('')
+        
+        self.session = self._create_session()
+        
+        self._commands = {
+            'help': self.show_help,
+            'functions': self.show_functions,
+            'examples': self.show_examples,
+            'unicode': self.show_unicode,
+            'clear': self.clear_screen,
+            'cls': self.clear_screen,
+            'history': self.show_history,
+        }
+    
+    def _create_session(self):
+        # Only the interactive session needs these; importing them here
+        # keeps the pygments lexers out of a plain 'import app'.
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import FileHistory
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+        from prompt_toolkit.lexers import PygmentsLexer
+        from pygments.lexers import PythonLexer
+        
+        history_file = os.path.expanduser('~/.pcs_history')
+        
+        return PromptSession(
+            history=FileHistory(history_file),
+            auto_suggest=AutoSuggestFromHistory(),
+            completer=PCSCompleter(),
+            lexer=PygmentsLexer(PythonLexer),
+            style=STYLE,
+            complete_while_typing=True,
+        )
+    
+    def get_prompt(self):
+        return HTML('<prompt>PCS</prompt> <arrow>></arrow> ')
+    
+    def evaluate(self, expression: str):
+        return self.pcs.evaluate(expression)
+    
+    def format_result(self, result) -> str:
+        return self.pcs.format_result(result)
+    
+    def format_unicode(self, expression: str) -> str:
+        return self.pcs.format_unicode(expression)
+    
+    def show_help(self):
+        sys.stdout.write(self._HELP_TEXT)
+    
+    def show_functions(self):
+        sys.stdout.write(self._FUNCTIONS_TEXT)
+    
+    def show_examples(self):
+        sys.stdout.write(self._EXAMPLES_TEXT)
     
     def show_unicode(self):
         formatter = UnicodeFormatter
         print("\n\033[1;36mBANG CHUYEN DOI UNICODE:\033[0m")
         print("-" * 40)
         print("\033[1;33mToan tu:\033[0m")
-        print(f"  *  -> {formatter.format_expression('*'):5}  (nhan)")
-        print(f"  /  -> {formatter.format_expression('/'):5}  (chia)")
-        print(f"  -  -> {formatter.format_expression('-'):5}  (tru)")
+        print(f"  *  -> {self.format_unicode('*'):5}  (nhan)")
+        print(f"  /  -> {self.format_unicode('/'):5}  (chia)")
+        print(f"  -  -> {self.format_unicode('-'):5}  (tru)")
         
         print("\n\033[1;33mSo mu (superscript):\033[0m")
-        for i in range(10):
-            sup = formatter.format_superscript(str(i))
+        for i, sup in enumerate(SUPERSCRIPT_DIGITS):
             print(f"  ^{i} -> {sup}", end="  ")
             if (i + 1) % 5 == 0:
                 print()
         
         print("\n\033[1;33mChi so duoi (subscript):\033[0m")
-        for i in range(10):
-            sub = formatter.format_subscript(str(i))
+        for i, sub in enumerate(SUBSCRIPT_DIGITS):
             print(f"  _{i} -> {sub}", end="  ")
             if (i + 1) % 5 == 0:
                 print()
@@ -254,8 +278,17 @@ class PCSShell:
             print(f"  {num}/{den} -> {frac_char}", end="  ")
         print("\n")
     
+    def show_history(self):
+        print("\n\033[1;36mLICH SU LENH:\033[0m")
+        print("  (Dung phim mui ten len/xuong de duyet lich su)")
+        print()
+    
     def clear_screen(self):
-        os.system('clear' if os.name != 'nt' else 'cls')
+        if sys.stdout.isatty():
+            sys.stdout.write(CLEAR_SCREEN)
+            sys.stdout.flush()
+        else:
+            os.system('clear' if os.name != 'nt' else 'cls')
     
     def run(self):
         self.clear_screen()
@@ -282,23 +315,13 @@ class PCSShell:
                 
                 cmd = text.lower()
                 
-                if cmd in ('exit', 'quit', 'q'):
+                if cmd in EXIT_COMMANDS:
                     print("\n\033[1;32mTam biet! Hen gap lai.\033[0m\n")
                     break
-                elif cmd == 'help':
-                    self.show_help()
-                elif cmd == 'functions':
-                    self.show_functions()
-                elif cmd == 'examples':
-                    self.show_examples()
-                elif cmd == 'unicode':
-                    self.show_unicode()
-                elif cmd in ('clear', 'cls'):
-                    self.clear_screen()
-                elif cmd == 'history':
-                    print("\n\033[1;36mLICH SU LENH:\033[0m")
-                    print("  (Dung phim mui ten len/xuong de duyet lich su)")
-                    print()
+                
+                handler = self._commands.get(cmd)
+                if handler is not None:
+                    handler()
                 else:
                     result = self.evaluate(text)
                     formatted = self.format_result(result)
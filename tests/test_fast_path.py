@@ -0,0 +1,43 @@
+"""The plain-arithmetic fast path in PSC.py must agree with the Evaluator."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PSC import PCS, BASIC_ARITHMETIC_EXPRESSIONS, _eval_arith
+from src.pcs.parser.tokenizer import Tokenizer
+from src.pcs.parser.parser import Parser
+from src.pcs.parser.evaluator import Evaluator
+
+
+def evaluate_slow(expression: str):
+    """Evaluate an expression through the tokenizer, parser and evaluator."""
+    tokens = Tokenizer(expression).tokenize()
+    return Evaluator().evaluate(Parser(tokens).parse())
+
+
+def describe(result):
+    return type(result.value), result.value, result.display_type
+
+
+@pytest.mark.parametrize("expression", BASIC_ARITHMETIC_EXPRESSIONS)
+def test_basic_arithmetic_matches_evaluator(expression):
+    fast = _eval_arith(expression)
+    assert fast is not None
+    assert describe(fast) == describe(evaluate_slow(expression))
+
+
+@pytest.mark.parametrize("expression", ["2 ** 3", "7 // 2", "007", "1/0", "2 (3)"])
+def test_python_only_syntax_falls_through(expression):
+    assert _eval_arith(expression) is None
+
+    try:
+        expected = evaluate_slow(expression)
+    except Exception as e:
+        with pytest.raises(type(e)):
+            PCS().evaluate(expression)
+    else:
+        assert describe(PCS().evaluate(expression)) == describe(expected)